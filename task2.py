@@ -1,20 +1,123 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from functools import partial
+from reportlab import rl_config
+# Chart shapes validate every attribute assignment while shapeChecking is on; it is read
+# when reportlab.graphics is imported, so it has to be switched off before those imports
+rl_config.shapeChecking = 0
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, inch
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, HRFlowable, Frame, PageTemplate
+    BaseDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, HRFlowable, Frame, PageTemplate
 )
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.graphics.charts.piecharts import Pie
 from reportlab.graphics.charts.lineplots import LinePlot
 from reportlab.graphics.shapes import Drawing, String
+import hashlib
+import io
+import math
 import os
 
+# Report styles, built once at import and shared by every report
+_SAMPLE_STYLES = getSampleStyleSheet()
+# Report paragraph styles, looked up by alias: title, heading, subheading, body, small
+_STYLES = StyleSheet1()
+_STYLES.add(ParagraphStyle(
+    'Title',
+    parent=_SAMPLE_STYLES['Heading1'],
+    fontSize=28,
+    alignment=1,
+    spaceAfter=20,
+    fontName='Helvetica-Bold'
+), alias='title')
+_STYLES.add(ParagraphStyle(
+    'Heading2',
+    parent=_SAMPLE_STYLES['Heading2'],
+    fontSize=18,
+    spaceAfter=12,
+    textColor=colors.darkblue,
+    fontName='Helvetica-Bold'
+), alias='heading')
+_STYLES.add(ParagraphStyle(
+    'Heading3',
+    parent=_SAMPLE_STYLES['Heading3'],
+    fontSize=14,
+    spaceAfter=8,
+    textColor=colors.darkgreen,
+    fontName='Helvetica-Bold'
+), alias='subheading')
+_STYLES.add(ParagraphStyle(
+    'BodyText',
+    parent=_SAMPLE_STYLES['BodyText'],
+    fontSize=11,
+    leading=16,
+    spaceAfter=8,
+    fontName='Helvetica'
+), alias='body')
+_STYLES.add(ParagraphStyle(
+    'Small',
+    parent=_SAMPLE_STYLES['BodyText'],
+    fontSize=9,
+    leading=12,
+    textColor=colors.grey
+), alias='small')
+
+_METRICS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.black),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,0), 12),
+    ('BOTTOMPADDING', (0,0), (-1,0), 12),
+    ('BACKGROUND', (0,1), (-1,-1), colors.whitesmoke),
+    ('GRID', (0,0), (-1,-1), 1, colors.grey)
+])
+_PROD_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#00a79d")),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('BACKGROUND', (0,1), (-1,-1), colors.HexColor("#e0f7fa")),
+    ('GRID', (0,0), (-1,-1), 1, colors.grey)
+])
+_COUNTRY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#27ae60")),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('BACKGROUND', (0,1), (-1,-1), colors.HexColor("#eafaf1")),
+    ('GRID', (0,0), (-1,-1), 1, colors.grey)
+])
+_MONTH_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#9b59b6")),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('BACKGROUND', (0,1), (-1,-1), colors.HexColor("#f5eaf7")),
+    ('GRID', (0,0), (-1,-1), 1, colors.grey)
+])
+
+# Narrative paragraphs, bound once as str.format callables
+_SUMMARY_TEXT = (
+    "In {year}, our company processed <b>{transactions}</b> sales transactions across "
+    "<b>{n_categories}</b> product categories and <b>{n_countries}</b> countries. "
+    "Total sales reached <b>${total_sales:,.2f}</b>, with an average transaction value of "
+    "<b>${avg_sale:,.2f}</b>. The <b>{top_category}</b> category led all segments, "
+    "contributing <b>${top_category_sales:,.2f}</b> to the annual revenue."
+).format
+_MONTH_INTRO_TEXT = (
+    "The following charts and table show the total sales for each month in {year}. "
+    "This helps in identifying seasonal trends and planning inventory accordingly."
+).format
+_CONCLUSION_TEXT = (
+    "The analysis of {year} sales data reveals strong performance in several categories and regions. "
+    "To capitalize on these trends, we recommend focusing marketing efforts on top-performing products and expanding in high-growth regions. "
+    "Continuous monitoring of monthly trends will help anticipate demand fluctuations and optimize inventory management."
+).format
+
 # Generate sample data if needed
-def generate_sample_data(filename, rows=100):
+def generate_sample_data(filename, rows=100, persist_csv=False):
     categories = [
         'Electronics', 'Clothing', 'Groceries', 'Furniture', 'Books',
         'Toys', 'Sports', 'Beauty', 'Automotive', 'Garden'
@@ -26,134 +129,271 @@ def generate_sample_data(filename, rows=100):
         f'Product {chr(65+i)}' for i in range(20)
     ]
     
-    # Use 2024 for the data period
-    dates = pd.date_range(start='2024-01-01', end='2024-12-31', periods=rows)
+    rng = np.random.default_rng()
+
+    # Draw int16 codes and build categoricals directly, no object arrays to sample from
+    def choose(labels):
+        return pd.Categorical.from_codes(rng.integers(0, len(labels), rows, dtype=np.int16), labels)
+
+    # Use 2024 for the data period; draw day offsets directly instead of sampling a date range
+    start = np.datetime64('2024-01-01')
+    span_days = int((np.datetime64('2024-12-31') - start).astype(int))
     data = {
-        'Date': np.random.choice(dates, rows),
-        'Product': np.random.choice(products, rows),
-        'Category': np.random.choice(categories, rows),
-        'Amount': np.random.uniform(10, 5000, rows).round(2),
-        'Country': np.random.choice(countries, rows)
+        'Date': start + rng.integers(0, span_days + 1, rows, dtype=np.int16).astype('timedelta64[D]'),
+        'Product': choose(products),
+        'Category': choose(categories),
+        'Amount': rng.uniform(10, 5000, rows).round(2),
+        'Country': choose(countries)
     }
     df = pd.DataFrame(data)
-    df.to_csv(filename, index=False)
+    # The report works from the in-memory frame; only write the CSV when asked to
+    if persist_csv:
+        # Write through a 1 MiB buffer so large sample sets need few write() calls; to_csv encodes UTF-8
+        with open(filename, 'wb', buffering=1 << 20) as fh:
+            df.to_csv(fh, index=False, lineterminator='\n')
     return df
 
+# Largest dense key space _group_sum will allocate bins for
+_DENSE_BIN_LIMIT = 1 << 22
+
+# Sum `value` per observed combination of `keys` with one np.bincount over the integer key codes
+def _group_sum(df, keys, value):
+    codes, levels = [], []
+    for key in keys:
+        col = df[key]
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            codes.append(col.cat.codes.to_numpy())
+            levels.append(col.cat.categories)
+        else:
+            key_codes, uniques = pd.factorize(col)
+            codes.append(key_codes)
+            levels.append(pd.Index(uniques))
+    sizes = tuple(len(level) for level in levels)
+    nbins = math.prod(sizes)
+    # Missing keys or a huge key space: let pandas hash the rows instead. Rows with a missing
+    # key stay in, so reducing to one key still counts them under the other keys
+    if nbins > _DENSE_BIN_LIMIT or any((key_codes < 0).any() for key_codes in codes):
+        return df.groupby(list(keys), sort=False, observed=True, dropna=False)[value].sum()
+    flat = np.ravel_multi_index(codes, sizes)
+    # Missing values add nothing, matching groupby().sum()
+    weights = np.nan_to_num(df[value].to_numpy(dtype=float), nan=0.0)
+    sums = np.bincount(flat, weights=weights, minlength=nbins)
+    observed = np.flatnonzero(np.bincount(flat, minlength=nbins))
+    index = pd.MultiIndex(levels=levels, codes=np.unravel_index(observed, sizes), names=list(keys))
+    return pd.Series(sums[observed], index=index.remove_unused_levels(), name=value)
+
+# Recent analyses keyed by a content hash of the input columns; oldest entry is evicted first
+_ANALYSIS_CACHE = {}
+_ANALYSIS_CACHE_SIZE = 8
+
+# Digest of the row hashes of `columns`; equal content gives an equal key regardless of the index
+def _content_key(df, columns):
+    row_hashes = pd.util.hash_pandas_object(df[list(columns)], index=False).to_numpy()
+    return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).digest()
+
+# Copy of an analysis dict with its own Series/DataFrames, so callers never share objects with the cache
+def _copy_results(results):
+    return {key: value.copy() if isinstance(value, (pd.Series, pd.DataFrame)) else value
+            for key, value in results.items()}
+
 # Analyze data
 def analyze_data(df):
     results = {}
-    df['Date'] = pd.to_datetime(df['Date'])
+    df['Date'] = pd.to_datetime(df['Date'], cache=True)
+    # Low-cardinality labels as category dtype so groupby works on integer codes
+    for col in ('Product', 'Category', 'Country'):
+        df[col] = df[col].astype('category')
+    # Integer month key (months since 1970-01) from one datetime64[M] cast; hashes faster than strftime strings.
+    # tz-aware dates are cast on their local wall clock, and a missing date stays missing (nullable Int32)
+    dates = df['Date']
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    dates = dates.to_numpy()
+    df['MonthKey'] = pd.arrays.IntegerArray(dates.astype('datetime64[M]').astype(np.int32), np.isnat(dates))
+
+    # Same rows as a recent call: reuse its results and skip the grouping work
+    key = _content_key(df, ('Date', 'Product', 'Category', 'Country', 'Amount'))
+    cached = _ANALYSIS_CACHE.get(key)
+    if cached is not None:
+        return _copy_results(cached)
     
     # Basic metrics
     results['total_sales'] = df['Amount'].sum()
     results['avg_sale'] = df['Amount'].mean()
     results['transactions'] = len(df)
     
-    # Grouped metrics
-    results['by_category'] = df.groupby('Category')['Amount'].sum().sort_values(ascending=False)
-    results['by_country'] = df.groupby('Country')['Amount'].sum().sort_values(ascending=False)
-    results['by_month'] = df.groupby(df['Date'].dt.strftime('%Y-%m'))['Amount'].sum()
-    results['top_products'] = df.groupby('Product')['Amount'].sum().nlargest(5)
-    
+    # Grouped metrics: aggregate once over all dimensions, then reduce the small result per dimension
+    agg = _group_sum(df, ('Category', 'Country', 'MonthKey', 'Product'), 'Amount')
+    # Format 'YYYY-MM' labels only for the distinct month keys
+    # (a missing month keeps a NaN label, which the per-dimension groupbys drop)
+    month_level = agg.index.levels[2]
+    month_starts = month_level.to_numpy(dtype=np.int64, na_value=0).astype('datetime64[M]')
+    month_labels = pd.Index(np.datetime_as_string(month_starts, unit='M')).where(~month_level.isna())
+    agg.index = agg.index.set_levels(month_labels, level='MonthKey').set_names('Month', level='MonthKey')
+    # Results are ranked right after, so skip the key sort; months keep it for a chronological axis
+    results['by_category'] = agg.groupby(level='Category', sort=False, observed=True).sum().sort_values(ascending=False)
+    results['by_country'] = agg.groupby(level='Country', sort=False, observed=True).sum().sort_values(ascending=False)
+    results['by_month'] = agg.groupby(level='Month', observed=True).sum()
+    results['top_products'] = agg.groupby(level='Product', sort=False, observed=True).sum().nlargest(5)
+    results['by_segment'] = agg
+
+    # Month x dimension pivots for the trend charts, aligned on one month axis
+    months = results['by_month'].index
+    for name, level in (('cat_month', 'Category'), ('prod_month', 'Product'), ('country_month', 'Country')):
+        pivot = agg.groupby(level=['Month', level], sort=False, observed=True).sum().unstack(fill_value=0)
+        results[name] = pivot.reindex(months, fill_value=0)
+
+    if len(_ANALYSIS_CACHE) >= _ANALYSIS_CACHE_SIZE:
+        del _ANALYSIS_CACHE[next(iter(_ANALYSIS_CACHE))]
+    # The cache keeps a private copy; in-place edits to the returned results do not reach it
+    _ANALYSIS_CACHE[key] = _copy_results(results)
     return results
 
-def add_page_number(canvas, doc):
-    page_num = canvas.getPageNumber()
-    text = f"Page {page_num}"
-    canvas.saveState()
-    canvas.setFont('Helvetica', 9)
-    canvas.setFillColor(colors.grey)
-    canvas.drawRightString(200*mm, 10*mm, text)
-    canvas.restoreState()
-
-# Generate PDF report
-def create_pdf_report(filename, data, analysis):
-    styles = getSampleStyleSheet()
-    # Custom styles
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Heading1'],
-        fontSize=28,
-        alignment=1,
-        spaceAfter=20,
-        fontName='Helvetica-Bold'
-    )
-    heading_style = ParagraphStyle(
-        'Heading2',
-        parent=styles['Heading2'],
-        fontSize=18,
-        spaceAfter=12,
-        textColor=colors.darkblue,
-        fontName='Helvetica-Bold'
-    )
-    subheading_style = ParagraphStyle(
-        'Heading3',
-        parent=styles['Heading3'],
-        fontSize=14,
-        spaceAfter=8,
-        textColor=colors.darkgreen,
-        fontName='Helvetica-Bold'
-    )
-    body_style = ParagraphStyle(
-        'BodyText',
-        parent=styles['BodyText'],
-        fontSize=11,
-        leading=16,
-        spaceAfter=8,
-        fontName='Helvetica'
-    )
-    small_style = ParagraphStyle(
-        'Small',
-        parent=styles['BodyText'],
-        fontSize=9,
-        leading=12,
-        textColor=colors.grey
-    )
+# Page footer font, colour and position, computed once rather than on every page
+_FOOTER_FONT = ('Helvetica', 9)
+_FOOTER_COLOR = colors.grey
+_FOOTER_X = 7.5*inch
+_FOOTER_Y = 0.5*inch
+
+# Page footer, drawn on every page; the defaults bind the constants as fast locals.
+# It runs as onPageEnd, after the page content, and the canvas resets its graphics state
+# at each new page, so the font and colour it sets need no saveState/restoreState
+def add_page_number(canvas, doc, _font=_FOOTER_FONT, _color=_FOOTER_COLOR, _x=_FOOTER_X, _y=_FOOTER_Y):
+    canvas.setFont(*_font)
+    canvas.setFillColor(_color)
+    canvas.drawRightString(_x, _y, f"Page {canvas.getPageNumber()}")
+
+# Chart settings shared by every report section, applied with _apply
+_PLOT_AREA = dict(x=70, y=50, height=180, width=350)
+_PIE_AREA = dict(x=100, y=35, width=150, height=150)
+_BAR_CATEGORY_LABELS = dict(angle=30, dx=8, dy=-2, fontSize=9)
+_BAR_GRID = dict(visibleGrid=True, gridStrokeColor=colors.lightgrey)
+_PIE_SLICES = dict(strokeWidth=1, strokeColor=colors.white, fontSize=9, fontName='Helvetica-Bold')
+
+def _apply(obj, attrs):
+    for name, value in attrs.items():
+        setattr(obj, name, value)
+
+# Chart builders shared by every report section
+def _bar_chart(series, fill, stroke, xtitle):
+    value_max = float(series.values.max())
+    drawing = Drawing(450, 250)
+    bc = VerticalBarChart()
+    _apply(bc, _PLOT_AREA)
+    bc.data = [list(series.values)]
+    bc.categoryAxis.categoryNames = list(series.index)
+    bc.valueAxis.valueMin = 0
+    bc.valueAxis.valueMax = value_max * 1.15
+    bc.valueAxis.valueStep = value_max / 5 if value_max else 1
+    bc.bars[0].fillColor = colors.HexColor(fill)
+    bc.bars[0].strokeColor = colors.HexColor(stroke)
+    bc.bars[0].strokeWidth = 1.5
+    _apply(bc.categoryAxis.labels, _BAR_CATEGORY_LABELS)
+    bc.valueAxis.labels.fontSize = 9
+    _apply(bc.categoryAxis, _BAR_GRID)
+    _apply(bc.valueAxis, _BAR_GRID)
+    drawing.add(bc)
+    drawing.add(String(220, 20, xtitle, fontSize=13, fontName='Helvetica-Bold'))
+    drawing.add(String(4, 125, "Sales", fontSize=13, fontName='Helvetica-Bold', angle=90))
+    return drawing
+
+def _pie_chart(series, slice_colors, title, title_pos):
+    drawing = Drawing(350, 220)
+    pie = Pie()
+    _apply(pie, _PIE_AREA)
+    pie.data = list(series.values)
+    pie.labels = list(series.index)
+    _apply(pie.slices, _PIE_SLICES)
+    for i, color in enumerate(slice_colors):
+        pie.slices[i].fillColor = colors.HexColor(color)
+    pie.sideLabels = True
+    drawing.add(pie)
+    drawing.add(String(title_pos[0], title_pos[1], title, fontSize=13, fontName='Helvetica-Bold'))
+    return drawing
+
+def _month_axis(months):
+    # x positions and tick formatter shared by every monthly line chart
+    labels = list(months)
+    xs = np.arange(len(labels)).tolist()
+    def fmt(i):
+        i = int(i)
+        return labels[i] if 0 <= i < len(labels) else ""
+    return xs, fmt
+
+def _line_chart(month_axis, frame, line_colors, legend=()):
+    # One line per column of `frame` (a month-indexed Series or DataFrame)
+    xs, fmt = month_axis
+    values = frame.to_numpy(dtype=float, na_value=0.0).reshape(len(xs), -1)
+    value_max = float(values.max())
+    drawing = Drawing(450, 250)
+    lp = LinePlot()
+    _apply(lp, _PLOT_AREA)
+    lp.data = [list(zip(xs, values[:, j].tolist())) for j in range(values.shape[1])]
+    lp.yValueAxis.valueMin = 0
+    lp.yValueAxis.valueMax = value_max * 1.15
+    lp.yValueAxis.valueStep = value_max / 5 if value_max else 1
+    lp.xValueAxis.valueMin = 0
+    lp.xValueAxis.valueMax = len(xs) - 1
+    lp.xValueAxis.valueSteps = xs
+    lp.xValueAxis.labelTextFormat = fmt
+    lp.xValueAxis.visibleGrid = True
+    lp.yValueAxis.visibleGrid = True
+    lp.xValueAxis.labels.fontSize = 8
+    lp.yValueAxis.labels.fontSize = 8
+    for i, color in enumerate(line_colors):
+        lp.lines[i].strokeColor = colors.HexColor(color)
+    drawing.add(lp)
+    drawing.add(String(20, 130, "Sales", fontSize=12, angle=90))
+    drawing.add(String(220, 15, "Month", fontSize=12))
+    legend_y = 220
+    for label in legend:
+        drawing.add(String(300, legend_y, label, fontSize=8))
+        legend_y -= 15
+    return drawing
 
-    doc = SimpleDocTemplate(
-        filename,
-        pagesize=letter,
-        rightMargin=36, leftMargin=36,
-        topMargin=36, bottomMargin=36
-    )
-    story = []
+# Report sections; each is a generator yielding its flowables in story order
+def _section_summary(data, analysis, year):
+    # Cover page, executive summary and key metrics table
 
     # Cover Page
-    story.append(Paragraph(f"Annual Sales Report", title_style))
-    story.append(Spacer(1, 0.2*inch))
-    story.append(Paragraph(f"<b>Generated on:</b> {datetime.now().strftime('%B %d, %Y %H:%M')}", body_style))
-    story.append(Paragraph(
+    yield Paragraph(f"Annual Sales Report", _STYLES['title'])
+    yield Spacer(1, 0.2*inch)
+    yield Paragraph(f"<b>Generated on:</b> {datetime.now().strftime('%B %d, %Y %H:%M')}", _STYLES['body'])
+    yield Paragraph(
         f"<b>Data Period:</b> {data['Date'].min().date()} to {data['Date'].max().date()}",
-        body_style))
-    story.append(Spacer(1, 0.5*inch))
-    story.append(HRFlowable(width="100%", thickness=2, color=colors.darkblue))
-    story.append(Spacer(1, 0.3*inch))
-    story.append(Paragraph(
-        f"<b>Total Sales:</b> <font size=16 color='darkgreen'>${analysis['total_sales']:,.2f}</font>", heading_style))
-    story.append(Spacer(1, 0.2*inch))
-    # story.append(Paragraph(
+        _STYLES['body'])
+    yield Spacer(1, 0.5*inch)
+    yield HRFlowable(width="100%", thickness=2, color=colors.darkblue)
+    yield Spacer(1, 0.3*inch)
+    yield Paragraph(
+        f"<b>Total Sales:</b> <font size=16 color='darkgreen'>${analysis['total_sales']:,.2f}</font>", _STYLES['heading'])
+    yield Spacer(1, 0.2*inch)
+    # yield Paragraph(
     #     "Prepared by: <b>Sales Analytics Team</b><br/>Confidential - For internal use only.",
-    #     small_style))
-    # story.append(PageBreak())
+    #     _STYLES['small'])
+    # yield PageBreak()
 
     # Executive Summary
-    story.append(Paragraph("Executive Summary", heading_style))
-    story.append(Spacer(1, 0.1*inch))
-    year = data['Date'].min().year if not data.empty else 2024
-    story.append(Paragraph(
-        f"In {year}, our company processed <b>{analysis['transactions']}</b> sales transactions across "
-        f"<b>{len(data['Category'].unique())}</b> product categories and <b>{len(data['Country'].unique())}</b> countries. "
-        f"Total sales reached <b>${analysis['total_sales']:,.2f}</b>, with an average transaction value of "
-        f"<b>${analysis['avg_sale']:,.2f}</b>. The <b>{analysis['by_category'].index[0]}</b> category led all segments, "
-        f"contributing <b>${analysis['by_category'].iloc[0]:,.2f}</b> to the annual revenue.",
-        body_style))
-    story.append(Paragraph(
+    yield Paragraph("Executive Summary", _STYLES['heading'])
+    yield Spacer(1, 0.1*inch)
+    yield Paragraph(
+        _SUMMARY_TEXT(
+            year=year,
+            transactions=analysis['transactions'],
+            n_categories=len(data['Category'].unique()),
+            n_countries=len(data['Country'].unique()),
+            total_sales=analysis['total_sales'],
+            avg_sale=analysis['avg_sale'],
+            top_category=analysis['by_category'].index[0],
+            top_category_sales=analysis['by_category'].iloc[0]),
+        _STYLES['body'])
+    yield Paragraph(
         "This report provides a comprehensive overview of sales performance, highlights top products, and identifies "
         "key trends and opportunities for growth. The following sections offer detailed breakdowns by category, region, and month.",
-        body_style))
-    story.append(Spacer(1, 0.2*inch))
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.grey))
-    story.append(Spacer(1, 0.2*inch))
+        _STYLES['body'])
+    yield Spacer(1, 0.2*inch)
+    yield HRFlowable(width="100%", thickness=1, color=colors.grey)
+    yield Spacer(1, 0.2*inch)
 
     # Key Metrics Table
     metrics_data = [
@@ -163,538 +403,238 @@ def create_pdf_report(filename, data, analysis):
         ['Top Category', f"{analysis['by_category'].index[0]} (${analysis['by_category'].iloc[0]:,.2f})"]
     ]
     metrics_table = Table(metrics_data, colWidths=[2.5*inch, 2.5*inch])
-    metrics_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.black),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,0), 12),
-        ('BOTTOMPADDING', (0,0), (-1,0), 12),
-        ('BACKGROUND', (0,1), (-1,-1), colors.whitesmoke),
-        ('GRID', (0,0), (-1,-1), 1, colors.grey)
-    ]))
-    story.append(metrics_table)
-    story.append(Spacer(1, 0.3*inch))
-    story.append(Paragraph(
+    metrics_table.setStyle(_METRICS_TABLE_STYLE)
+    yield metrics_table
+    yield Spacer(1, 0.3*inch)
+    yield Paragraph(
         "The table above summarizes the most important sales metrics for the year. "
         "The top category contributed significantly to the overall revenue.",
-        body_style))
-    story.append(PageBreak())
+        _STYLES['body'])
+    yield PageBreak()
+
+def _section_category(analysis, month_axis):
+    # Category bar, pie and monthly trend charts
 
     # Category Performance
-    story.append(Paragraph("Sales by Category", heading_style))
-    story.append(Spacer(1, 0.1*inch))
-    story.append(Paragraph(
+    yield Paragraph("Sales by Category", _STYLES['heading'])
+    yield Spacer(1, 0.1*inch)
+    yield Paragraph(
         "The charts below illustrate the distribution of sales across different product categories. "
         "These visualizations help identify which categories are driving the most revenue and where to focus future efforts.",
-        body_style))
+        _STYLES['body'])
 
     # Bar Chart for Category
-    drawing_bar = Drawing(450, 250)
-    bc = VerticalBarChart()
-    bc.x = 70
-    bc.y = 50
-    bc.height = 180
-    bc.width = 350
-    bc.data = [list(analysis['by_category'].values)]
-    bc.categoryAxis.categoryNames = list(analysis['by_category'].index)
-    bc.valueAxis.valueMin = 0
-    bc.valueAxis.valueMax = float(max(analysis['by_category'].values)) * 1.15
-    bc.valueAxis.valueStep = float(max(analysis['by_category'].values)) / 5 if max(analysis['by_category'].values) else 1
-    bc.bars[0].fillColor = colors.HexColor("#3b5998")
-    bc.bars[0].strokeColor = colors.HexColor("#1a237e")
-    bc.bars[0].strokeWidth = 1.5
-    bc.categoryAxis.labels.angle = 30
-    bc.categoryAxis.labels.dx = 8
-    bc.categoryAxis.labels.dy = -2
-    bc.categoryAxis.labels.fontSize = 9
-    bc.valueAxis.labels.fontSize = 9
-    bc.categoryAxis.visibleGrid = True
-    bc.valueAxis.visibleGrid = True
-    bc.valueAxis.gridStrokeColor = colors.lightgrey
-    bc.categoryAxis.gridStrokeColor = colors.lightgrey
-    drawing_bar.add(bc)
-    drawing_bar.add(String(220, 20, "Category", fontSize=13, fontName='Helvetica-Bold'))
-    drawing_bar.add(String(4, 125, "Sales", fontSize=13, fontName='Helvetica-Bold', angle=90))
-    story.append(Paragraph("Bar Chart: Sales by Category", subheading_style))
-    story.append(drawing_bar)
-    story.append(Spacer(1, 0.2*inch))
+    yield Paragraph("Bar Chart: Sales by Category", _STYLES['subheading'])
+    yield _bar_chart(analysis['by_category'], "#3b5998", "#1a237e", "Category")
+    yield Spacer(1, 0.2*inch)
 
     # Pie Chart for Category
-    drawing_pie = Drawing(350, 220)
-    pie = Pie()
-    pie.x = 100
-    pie.y = 35
-    pie.width = 150
-    pie.height = 150
-    pie.data = list(analysis['by_category'].values)
-    pie.labels = list(analysis['by_category'].index)
-    pie.slices.strokeWidth = 1
-    pie.slices.strokeColor = colors.white
-    pie.slices[0].fillColor = colors.HexColor("#3b5998")
-    pie.slices[1].fillColor = colors.HexColor("#8b9dc3")
-    pie.slices[2].fillColor = colors.HexColor("#00a79d")
-    pie.slices[3].fillColor = colors.HexColor("#f39c12")
-    pie.slices[4].fillColor = colors.HexColor("#e74c3c")
-    # Add more colors if needed
-    pie.sideLabels = True
-    pie.slices.fontSize = 9
-    pie.slices.fontName = 'Helvetica-Bold'
-    drawing_pie.add(pie)
-    drawing_pie.add(String(150, 10, "Category Share", fontSize=13, fontName='Helvetica-Bold'))
-    story.append(Paragraph("Pie Chart: Category Market Share", subheading_style))
-    story.append(drawing_pie)
-    story.append(Spacer(1, 0.2*inch))
-    story.append(PageBreak())
+    yield Paragraph("Pie Chart: Category Market Share", _STYLES['subheading'])
+    yield _pie_chart(
+        analysis['by_category'],
+        ["#3b5998", "#8b9dc3", "#00a79d", "#f39c12", "#e74c3c"],
+        "Category Share", (150, 10))
+    yield Spacer(1, 0.2*inch)
+    yield PageBreak()
 
     # Line Chart for Category (showing monthly trend per top 3 categories)
     top3_cats = analysis['by_category'].index[:3]
-    monthly = data.copy()
-    monthly['Month'] = monthly['Date'].dt.strftime('%Y-%m')
-    cat_month = monthly.groupby(['Month', 'Category'])['Amount'].sum().unstack().fillna(0)
-    months = list(cat_month.index)
-    drawing_line = Drawing(450, 250)
-    lp = LinePlot()
-    lp.x = 70
-    lp.y = 50
-    lp.height = 180
-    lp.width = 350
-    lp.data = [
-        [(i, cat_month.iloc[i][cat]) for i in range(len(months))]
-        for cat in top3_cats
-    ]
-    max_sales = cat_month[top3_cats].values.max()
-    lp.yValueAxis.valueMin = 0
-    lp.yValueAxis.valueMax = float(max_sales) * 1.15
-    lp.yValueAxis.valueStep = float(max_sales) / 5 if max_sales else 1
-    lp.xValueAxis.valueMin = 0
-    lp.xValueAxis.valueMax = len(months) - 1
-    lp.xValueAxis.valueSteps = list(range(len(months)))
-    lp.xValueAxis.labelTextFormat = lambda i: months[int(i)] if int(i) < len(months) else ""
-    lp.xValueAxis.visibleGrid = True
-    lp.yValueAxis.visibleGrid = True
-    lp.xValueAxis.labels.fontSize = 8
-    lp.yValueAxis.labels.fontSize = 8
-    lp.lines[0].strokeColor = colors.HexColor("#3b5998")
-    lp.lines[1].strokeColor = colors.HexColor("#f39c12")
-    lp.lines[2].strokeColor = colors.HexColor("#e74c3c")
-    drawing_line.add(lp)
-    drawing_line.add(String(20, 130, "Sales", fontSize=12, angle=90))
-    drawing_line.add(String(220, 15, "Month", fontSize=12))
-    legend_y = 220
-    for i, cat in enumerate(top3_cats):
-        drawing_line.add(String(300, legend_y, cat, fontSize=8))
-        legend_y -= 15
-    story.append(Paragraph("Line Chart: Monthly Sales Trend (Top 3 Categories)", subheading_style))
-    story.append(drawing_line)
-    story.append(Spacer(1, 0.3*inch))
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.grey))
-    story.append(Spacer(1, 0.2*inch))
+    cat_month = analysis['cat_month']
+    yield Paragraph("Line Chart: Monthly Sales Trend (Top 3 Categories)", _STYLES['subheading'])
+    yield _line_chart(
+        month_axis, cat_month[list(top3_cats)], ["#3b5998", "#f39c12", "#e74c3c"], legend=top3_cats)
+    yield Spacer(1, 0.3*inch)
+    yield HRFlowable(width="100%", thickness=1, color=colors.grey)
+    yield Spacer(1, 0.2*inch)
+
+def _section_products(analysis, month_axis):
+    # Top product charts and table
 
     # Top Products Table
-    story.append(Paragraph("Top Performing Products", heading_style))
-    story.append(Spacer(1, 0.1*inch))
-    story.append(Paragraph(
+    yield Paragraph("Top Performing Products", _STYLES['heading'])
+    yield Spacer(1, 0.1*inch)
+    yield Paragraph(
         "The following charts and table list the top five products by total sales. "
         "These products have shown outstanding performance during the year and represent key revenue drivers.",
-        body_style))
+        _STYLES['body'])
 
     # Bar Chart for Top Products
-    drawing_prod_bar = Drawing(450, 250)
-    bc_prod = VerticalBarChart()
-    bc_prod.x = 70
-    bc_prod.y = 50
-    bc_prod.height = 180
-    bc_prod.width = 350
-    bc_prod.data = [list(analysis['top_products'].values)]
-    bc_prod.categoryAxis.categoryNames = list(analysis['top_products'].index)
-    bc_prod.valueAxis.valueMin = 0
-    bc_prod.valueAxis.valueMax = float(max(analysis['top_products'].values)) * 1.15
-    bc_prod.valueAxis.valueStep = float(max(analysis['top_products'].values)) / 5 if max(analysis['top_products'].values) else 1
-    bc_prod.bars[0].fillColor = colors.HexColor("#00a79d")
-    bc_prod.bars[0].strokeColor = colors.HexColor("#00695c")
-    bc_prod.bars[0].strokeWidth = 1.5
-    bc_prod.categoryAxis.labels.angle = 30
-    bc_prod.categoryAxis.labels.dx = 8
-    bc_prod.categoryAxis.labels.dy = -2
-    bc_prod.categoryAxis.labels.fontSize = 9
-    bc_prod.valueAxis.labels.fontSize = 9
-    bc_prod.categoryAxis.visibleGrid = True
-    bc_prod.valueAxis.visibleGrid = True
-    bc_prod.valueAxis.gridStrokeColor = colors.lightgrey
-    bc_prod.categoryAxis.gridStrokeColor = colors.lightgrey
-    drawing_prod_bar.add(bc_prod)
-    drawing_prod_bar.add(String(220, 20, "Product", fontSize=13, fontName='Helvetica-Bold'))
-    drawing_prod_bar.add(String(4, 125, "Sales", fontSize=13, fontName='Helvetica-Bold', angle=90))
-    story.append(Paragraph("Bar Chart: Top 5 Products by Sales", subheading_style))
-    story.append(drawing_prod_bar)
-    story.append(Spacer(1, 0.2*inch))
-    story.append(PageBreak())
+    yield Paragraph("Bar Chart: Top 5 Products by Sales", _STYLES['subheading'])
+    yield _bar_chart(analysis['top_products'], "#00a79d", "#00695c", "Product")
+    yield Spacer(1, 0.2*inch)
+    yield PageBreak()
 
     # Pie Chart for Top Products
-    drawing_prod_pie = Drawing(350, 220)
-    pie_prod = Pie()
-    pie_prod.x = 100
-    pie_prod.y = 35
-    pie_prod.width = 150
-    pie_prod.height = 150
-    pie_prod.data = list(analysis['top_products'].values)
-    pie_prod.labels = list(analysis['top_products'].index)
-    pie_prod.slices.strokeWidth = 1
-    pie_prod.slices.strokeColor = colors.white
-    pie_prod.slices[0].fillColor = colors.HexColor("#00a79d")
-    pie_prod.slices[1].fillColor = colors.HexColor("#f39c12")
-    pie_prod.slices[2].fillColor = colors.HexColor("#e74c3c")
-    pie_prod.slices[3].fillColor = colors.HexColor("#3b5998")
-    pie_prod.slices[4].fillColor = colors.HexColor("#8b9dc3")
-    pie_prod.sideLabels = True
-    pie_prod.slices.fontSize = 9
-    pie_prod.slices.fontName = 'Helvetica-Bold'
-    drawing_prod_pie.add(pie_prod)
-    drawing_prod_pie.add(String(150, 15, "Product Share", fontSize=13, fontName='Helvetica-Bold'))
-    story.append(Paragraph("Pie Chart: Top 5 Products Market Share", subheading_style))
-    story.append(drawing_prod_pie)
-    story.append(Spacer(1, 0.2*inch))
+    yield Paragraph("Pie Chart: Top 5 Products Market Share", _STYLES['subheading'])
+    yield _pie_chart(
+        analysis['top_products'],
+        ["#00a79d", "#f39c12", "#e74c3c", "#3b5998", "#8b9dc3"],
+        "Product Share", (150, 15))
+    yield Spacer(1, 0.2*inch)
     
     # Line Chart for Top Products (monthly trend)
     top_products = analysis['top_products'].index
-    prod_month = monthly.groupby(['Month', 'Product'])['Amount'].sum().unstack().fillna(0)
-    drawing_prod_line = Drawing(450, 250)
-    lp_prod = LinePlot()
-    lp_prod.x = 70
-    lp_prod.y = 50
-    lp_prod.height = 180
-    lp_prod.width = 350
-    lp_prod.data = [
-        [(i, prod_month.iloc[i][prod]) for i in range(len(months))]
-        for prod in top_products
-    ]
-    max_prod_sales = prod_month[top_products].values.max()
-    lp_prod.yValueAxis.valueMin = 0
-    lp_prod.yValueAxis.valueMax = float(max_prod_sales) * 1.15
-    lp_prod.yValueAxis.valueStep = float(max_prod_sales) / 5 if max_prod_sales else 1
-    lp_prod.xValueAxis.valueMin = 0
-    lp_prod.xValueAxis.valueMax = len(months) - 1
-    lp_prod.xValueAxis.valueSteps = list(range(len(months)))
-    lp_prod.xValueAxis.labelTextFormat = lambda i: months[int(i)] if int(i) < len(months) else ""
-    lp_prod.xValueAxis.visibleGrid = True
-    lp_prod.yValueAxis.visibleGrid = True
-    lp_prod.xValueAxis.labels.fontSize = 8
-    lp_prod.yValueAxis.labels.fontSize = 8
-    prod_colors = [
-        colors.HexColor("#00a79d"),
-        colors.HexColor("#f39c12"),
-        colors.HexColor("#e74c3c"),
-        colors.HexColor("#3b5998"),
-        colors.HexColor("#8b9dc3"),
-    ]
-    for i, color in enumerate(prod_colors):
-        lp_prod.lines[i].strokeColor = color
-    drawing_prod_line.add(lp_prod)
-    drawing_prod_line.add(String(20, 130, "Sales", fontSize=12, angle=90))
-    drawing_prod_line.add(String(220, 15, "Month", fontSize=12))
-    legend_y = 220
-    for i, prod in enumerate(top_products):
-        drawing_prod_line.add(String(300, legend_y, prod, fontSize=8))
-        legend_y -= 15
-    story.append(Paragraph("Line Chart: Monthly Sales Trend (Top 5 Products)", subheading_style))
-    story.append(drawing_prod_line)
-    story.append(Spacer(1, 0.2*inch))
+    prod_month = analysis['prod_month']
+    yield Paragraph("Line Chart: Monthly Sales Trend (Top 5 Products)", _STYLES['subheading'])
+    yield _line_chart(
+        month_axis, prod_month[list(top_products)],
+        ["#00a79d", "#f39c12", "#e74c3c", "#3b5998", "#8b9dc3"], legend=top_products)
+    yield Spacer(1, 0.2*inch)
 
     # Table for Top Products
     top_prod_data = [['Product', 'Total Sales']]
     for product, sales in analysis['top_products'].items():
         top_prod_data.append([product, f"${sales:,.2f}"])
     prod_table = Table(top_prod_data, colWidths=[3*inch, 2*inch])
-    prod_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#00a79d")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('BACKGROUND', (0,1), (-1,-1), colors.HexColor("#e0f7fa")),
-        ('GRID', (0,0), (-1,-1), 1, colors.grey)
-    ]))
-    story.append(prod_table)
-    story.append(Spacer(1, 0.2*inch))
-    story.append(PageBreak())
+    prod_table.setStyle(_PROD_TABLE_STYLE)
+    yield prod_table
+    yield Spacer(1, 0.2*inch)
+    yield PageBreak()
+
+def _section_country(analysis, month_axis):
+    # Regional charts and market share table
 
     # Regional Performance
-    story.append(Paragraph("Regional Performance", heading_style))
-    story.append(Spacer(1, 0.1*inch))
-    story.append(Paragraph(
+    yield Paragraph("Regional Performance", _STYLES['heading'])
+    yield Spacer(1, 0.1*inch)
+    yield Paragraph(
         "This section provides a breakdown of sales by country, including each region's market share. "
         "Understanding regional performance is crucial for strategic planning and resource allocation.",
-        body_style))
+        _STYLES['body'])
 
     # Bar Chart for Country
-    drawing_country_bar = Drawing(450, 250)
-    bc_country = VerticalBarChart()
-    bc_country.x = 70
-    bc_country.y = 50
-    bc_country.height = 180
-    bc_country.width = 350
-    bc_country.data = [list(analysis['by_country'].values)]
-    bc_country.categoryAxis.categoryNames = list(analysis['by_country'].index)
-    bc_country.valueAxis.valueMin = 0
-    bc_country.valueAxis.valueMax = float(max(analysis['by_country'].values)) * 1.15
-    bc_country.valueAxis.valueStep = float(max(analysis['by_country'].values)) / 5 if max(analysis['by_country'].values) else 1
-    bc_country.bars[0].fillColor = colors.HexColor("#f39c12")
-    bc_country.bars[0].strokeColor = colors.HexColor("#b35400")
-    bc_country.bars[0].strokeWidth = 1.5
-    bc_country.categoryAxis.labels.angle = 30
-    bc_country.categoryAxis.labels.dx = 8
-    bc_country.categoryAxis.labels.dy = -2
-    bc_country.categoryAxis.labels.fontSize = 9
-    bc_country.valueAxis.labels.fontSize = 9
-    bc_country.categoryAxis.visibleGrid = True
-    bc_country.valueAxis.visibleGrid = True
-    bc_country.valueAxis.gridStrokeColor = colors.lightgrey
-    bc_country.categoryAxis.gridStrokeColor = colors.lightgrey
-    drawing_country_bar.add(bc_country)
-    drawing_country_bar.add(String(220, 20, "Country", fontSize=13, fontName='Helvetica-Bold'))
-    drawing_country_bar.add(String(4, 125, "Sales", fontSize=13, fontName='Helvetica-Bold', angle=90))
-    story.append(Paragraph("Bar Chart: Sales by Country", subheading_style))
-    story.append(drawing_country_bar)
-    story.append(Spacer(1, 0.2*inch))
+    yield Paragraph("Bar Chart: Sales by Country", _STYLES['subheading'])
+    yield _bar_chart(analysis['by_country'], "#f39c12", "#b35400", "Country")
+    yield Spacer(1, 0.2*inch)
 
     # Pie Chart for Country
-    drawing_country_pie = Drawing(350, 220)
-    pie_country = Pie()
-    pie_country.x = 100
-    pie_country.y = 35
-    pie_country.width = 150
-    pie_country.height = 150
-    pie_country.data = list(analysis['by_country'].values)
-    pie_country.labels = list(analysis['by_country'].index)
-    pie_country.slices.strokeWidth = 1
-    pie_country.slices.strokeColor = colors.white
-    country_colors = [
-        colors.HexColor("#f39c12"), colors.HexColor("#e74c3c"), colors.HexColor("#3b5998"),
-        colors.HexColor("#00a79d"), colors.HexColor("#8b9dc3"), colors.HexColor("#27ae60"),
-        colors.HexColor("#9b59b6"), colors.HexColor("#34495e"), colors.HexColor("#16a085"),
-        colors.HexColor("#d35400")
-    ]
-    for i, color in enumerate(country_colors):
-        if i < len(pie_country.slices):
-            pie_country.slices[i].fillColor = color
-    pie_country.sideLabels = True
-    pie_country.slices.fontSize = 9
-    pie_country.slices.fontName = 'Helvetica-Bold'
-    drawing_country_pie.add(pie_country)
-    drawing_country_pie.add(String(175, 15, "Country Share", fontSize=13, fontName='Helvetica-Bold'))
-    story.append(Paragraph("Pie Chart: Country Market Share", subheading_style))
-    story.append(drawing_country_pie)
-    story.append(Spacer(1, 0.2*inch))
-    story.append(PageBreak())
+    yield Paragraph("Pie Chart: Country Market Share", _STYLES['subheading'])
+    yield _pie_chart(
+        analysis['by_country'],
+        ["#f39c12", "#e74c3c", "#3b5998", "#00a79d", "#8b9dc3", "#27ae60",
+         "#9b59b6", "#34495e", "#16a085", "#d35400"],
+        "Country Share", (175, 15))
+    yield Spacer(1, 0.2*inch)
+    yield PageBreak()
 
     # Line Chart for Country (monthly trend for top 3 countries)
     top3_countries = analysis['by_country'].index[:3]
-    country_month = monthly.groupby(['Month', 'Country'])['Amount'].sum().unstack().fillna(0)
-    drawing_country_line = Drawing(450, 250)
-    lp_country = LinePlot()
-    lp_country.x = 70
-    lp_country.y = 50
-    lp_country.height = 180
-    lp_country.width = 350
-    lp_country.data = [
-        [(i, country_month.iloc[i][country]) for i in range(len(months))]
-        for country in top3_countries
-    ]
-    max_country_sales = country_month[top3_countries].values.max()
-    lp_country.yValueAxis.valueMin = 0
-    lp_country.yValueAxis.valueMax = float(max_country_sales) * 1.15
-    lp_country.yValueAxis.valueStep = float(max_country_sales) / 5 if max_country_sales else 1
-    lp_country.xValueAxis.valueMin = 0
-    lp_country.xValueAxis.valueMax = len(months) - 1
-    lp_country.xValueAxis.valueSteps = list(range(len(months)))
-    lp_country.xValueAxis.labelTextFormat = lambda i: months[int(i)] if int(i) < len(months) else ""
-    lp_country.xValueAxis.visibleGrid = True
-    lp_country.yValueAxis.visibleGrid = True
-    lp_country.xValueAxis.labels.fontSize = 8
-    lp_country.yValueAxis.labels.fontSize = 8
-    country_colors = [
-        colors.HexColor("#f39c12"),
-        colors.HexColor("#e74c3c"),
-        colors.HexColor("#3b5998")
-    ]
-    for i, color in enumerate(country_colors):
-        lp_country.lines[i].strokeColor = color
-    drawing_country_line.add(lp_country)
-    drawing_country_line.add(String(20, 130, "Sales", fontSize=12, angle=90))
-    drawing_country_line.add(String(220, 15, "Month", fontSize=12))
-    legend_y = 220
-    for i, country in enumerate(top3_countries):
-        drawing_country_line.add(String(300, legend_y, country, fontSize=8))
-        legend_y -= 15
-    story.append(Paragraph("Line Chart: Monthly Sales Trend (Top 3 Countries)", subheading_style))
-    story.append(drawing_country_line)
-    story.append(Spacer(1, 0.2*inch))
+    country_month = analysis['country_month']
+    yield Paragraph("Line Chart: Monthly Sales Trend (Top 3 Countries)", _STYLES['subheading'])
+    yield _line_chart(
+        month_axis, country_month[list(top3_countries)], ["#f39c12", "#e74c3c", "#3b5998"], legend=top3_countries)
+    yield Spacer(1, 0.2*inch)
 
     # Table for Country
+    sales = analysis['by_country'].to_numpy(dtype=float)
+    shares = sales / analysis['total_sales'] * 100.0
     country_data = [['Country', 'Total Sales', 'Market Share']]
-    for country, sales in analysis['by_country'].items():
-        share = (sales / analysis['total_sales']) * 100
-        country_data.append([
-            country, 
-            f"${sales:,.2f}", 
-            f"{share:.1f}%"
-        ])
+    country_data += [
+        [country, f"${value:,.2f}", f"{share:.1f}%"]
+        for country, value, share in zip(analysis['by_country'].index.tolist(), sales.tolist(), shares.tolist())
+    ]
     country_table = Table(country_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch])
-    country_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#27ae60")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('BACKGROUND', (0,1), (-1,-1), colors.HexColor("#eafaf1")),
-        ('GRID', (0,0), (-1,-1), 1, colors.grey)
-    ]))
-    story.append(country_table)
-    story.append(Spacer(1, 0.2*inch))
-    story.append(Paragraph(
+    country_table.setStyle(_COUNTRY_TABLE_STYLE)
+    yield country_table
+    yield Spacer(1, 0.2*inch)
+    yield Paragraph(
         "The above table highlights the contribution of each country to the total sales. "
         "Regions with higher market share may present opportunities for further growth.",
-        body_style))
-    story.append(PageBreak())
+        _STYLES['body'])
+    yield PageBreak()
+
+def _section_month(analysis, month_axis, year):
+    # Monthly sales charts and table
 
     # Monthly Sales Trend
-    story.append(Paragraph("Monthly Sales Trend", heading_style))
-    story.append(Spacer(1, 0.1*inch))
-    story.append(Paragraph(
-        f"The following charts and table show the total sales for each month in {year}. "
-        "This helps in identifying seasonal trends and planning inventory accordingly.",
-        body_style))
+    yield Paragraph("Monthly Sales Trend", _STYLES['heading'])
+    yield Spacer(1, 0.1*inch)
+    yield Paragraph(
+        _MONTH_INTRO_TEXT(year=year),
+        _STYLES['body'])
 
     # Bar Chart for Monthly Sales
-    drawing_month_bar = Drawing(450, 250)
-    bc_month = VerticalBarChart()
-    bc_month.x = 70
-    bc_month.y = 50
-    bc_month.height = 180
-    bc_month.width = 350
-    bc_month.data = [list(analysis['by_month'].values)]
-    bc_month.categoryAxis.categoryNames = list(analysis['by_month'].index)
-    bc_month.valueAxis.valueMin = 0
-    bc_month.valueAxis.valueMax = float(max(analysis['by_month'].values)) * 1.15
-    bc_month.valueAxis.valueStep = float(max(analysis['by_month'].values)) / 5 if max(analysis['by_month'].values) else 1
-    bc_month.bars[0].fillColor = colors.HexColor("#9b59b6")
-    bc_month.bars[0].strokeColor = colors.HexColor("#512da8")
-    bc_month.bars[0].strokeWidth = 1.5
-    bc_month.categoryAxis.labels.angle = 30
-    bc_month.categoryAxis.labels.dx = 8
-    bc_month.categoryAxis.labels.dy = -2
-    bc_month.categoryAxis.labels.fontSize = 9
-    bc_month.valueAxis.labels.fontSize = 9
-    bc_month.categoryAxis.visibleGrid = True
-    bc_month.valueAxis.visibleGrid = True
-    bc_month.valueAxis.gridStrokeColor = colors.lightgrey
-    bc_month.categoryAxis.gridStrokeColor = colors.lightgrey
-    drawing_month_bar.add(bc_month)
-    drawing_month_bar.add(String(220, 20, "Month", fontSize=13, fontName='Helvetica-Bold'))
-    drawing_month_bar.add(String(4, 125, "Sales", fontSize=13, fontName='Helvetica-Bold', angle=90))
-    story.append(Paragraph("Bar Chart: Sales by Month", subheading_style))
-    story.append(drawing_month_bar)
-    story.append(Spacer(1, 0.2*inch))
+    yield Paragraph("Bar Chart: Sales by Month", _STYLES['subheading'])
+    yield _bar_chart(analysis['by_month'], "#9b59b6", "#512da8", "Month")
+    yield Spacer(1, 0.2*inch)
 
     # Pie Chart for Monthly Sales
-    drawing_month_pie = Drawing(350, 220)
-    pie_month = Pie()
-    pie_month.x = 100
-    pie_month.y = 35
-    pie_month.width = 150
-    pie_month.height = 150
-    pie_month.data = list(analysis['by_month'].values)
-    pie_month.labels = list(analysis['by_month'].index)
-    pie_month.slices.strokeWidth = 1
-    pie_month.slices.strokeColor = colors.white
-    month_colors = [
-        colors.HexColor("#9b59b6"), colors.HexColor("#e74c3c"), colors.HexColor("#3b5998"),
-        colors.HexColor("#00a79d"), colors.HexColor("#8b9dc3"), colors.HexColor("#27ae60"),
-        colors.HexColor("#f39c12"), colors.HexColor("#34495e"), colors.HexColor("#16a085"),
-        colors.HexColor("#d35400"), colors.HexColor("#e67e22"), colors.HexColor("#2980b9")
-    ]
-    for i, color in enumerate(month_colors):
-        if i < len(pie_month.slices):
-            pie_month.slices[i].fillColor = color
-    pie_month.sideLabels = True
-    pie_month.slices.fontSize = 9
-    pie_month.slices.fontName = 'Helvetica-Bold'
-    drawing_month_pie.add(pie_month)
-    drawing_month_pie.add(String(175, 15, "Month Share", fontSize=13, fontName='Helvetica-Bold'))
-    story.append(Paragraph("Pie Chart: Monthly Sales Share", subheading_style))
-    story.append(drawing_month_pie)
-    story.append(Spacer(1, 0.2*inch))
-    story.append(PageBreak())
+    yield Paragraph("Pie Chart: Monthly Sales Share", _STYLES['subheading'])
+    yield _pie_chart(
+        analysis['by_month'],
+        ["#9b59b6", "#e74c3c", "#3b5998", "#00a79d", "#8b9dc3", "#27ae60",
+         "#f39c12", "#34495e", "#16a085", "#d35400", "#e67e22", "#2980b9"],
+        "Month Share", (175, 15))
+    yield Spacer(1, 0.2*inch)
+    yield PageBreak()
 
     # Line Chart for Monthly Sales
-    drawing_month_line = Drawing(450, 250)
-    lp_month = LinePlot()
-    lp_month.x = 70
-    lp_month.y = 50
-    lp_month.height = 180
-    lp_month.width = 350
-    lp_month.data = [[(i, v) for i, v in enumerate(list(analysis['by_month'].values))]]
-    lp_month.lines[0].strokeColor = colors.HexColor("#9b59b6")
-    max_month_sales = max(analysis['by_month'].values) if len(analysis['by_month']) > 0 else 1
-    lp_month.yValueAxis.valueMin = 0
-    lp_month.yValueAxis.valueMax = float(max_month_sales) * 1.15
-    lp_month.yValueAxis.valueStep = float(max_month_sales) / 5 if max_month_sales else 1
-    lp_month.xValueAxis.valueMin = 0
-    lp_month.xValueAxis.valueMax = len(analysis['by_month']) - 1
-    lp_month.xValueAxis.valueSteps = list(range(len(analysis['by_month'])))
-    months_list = list(analysis['by_month'].index)
-    lp_month.xValueAxis.labelTextFormat = lambda i: months_list[int(i)] if int(i) < len(months_list) else ""
-    lp_month.xValueAxis.visibleGrid = True
-    lp_month.yValueAxis.visibleGrid = True
-    lp_month.xValueAxis.labels.fontSize = 8
-    lp_month.yValueAxis.labels.fontSize = 8
-    drawing_month_line.add(lp_month)
-    drawing_month_line.add(String(20, 130, "Sales", fontSize=12, angle=90))
-    drawing_month_line.add(String(220, 15, "Month", fontSize=12))
-    story.append(Paragraph("Line Chart: Monthly Sales Trend", subheading_style))
-    story.append(drawing_month_line)
-    story.append(Spacer(1, 0.2*inch))
+    yield Paragraph("Line Chart: Monthly Sales Trend", _STYLES['subheading'])
+    yield _line_chart(month_axis, analysis['by_month'], ["#9b59b6"])
+    yield Spacer(1, 0.2*inch)
 
     # Table for Monthly Sales
     month_data = [['Month', 'Total Sales']]
     for month, sales in analysis['by_month'].items():
         month_data.append([month, f"${sales:,.2f}"])
     month_table = Table(month_data, colWidths=[2*inch, 2*inch])
-    month_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#9b59b6")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('BACKGROUND', (0,1), (-1,-1), colors.HexColor("#f5eaf7")),
-        ('GRID', (0,0), (-1,-1), 1, colors.grey)
-    ]))
-    story.append(month_table)
-    story.append(Spacer(1, 0.2*inch))
-    # story.append(Paragraph(
+    month_table.setStyle(_MONTH_TABLE_STYLE)
+    yield month_table
+    yield Spacer(1, 0.2*inch)
+    # yield Paragraph(
     #     "Monitoring monthly sales enables the business to adapt to changing market conditions and optimize sales strategies.",
-    #     body_style))
-    story.append(PageBreak())
+    #     _STYLES['body'])
+    yield PageBreak()
+
+def _section_conclusion(year):
+    # Conclusion and recommendations
 
     # Conclusion
-    story.append(Paragraph("Conclusion & Recommendations", heading_style))
-    story.append(Spacer(1, 0.1*inch))
-    story.append(Paragraph(
-        f"The analysis of {year} sales data reveals strong performance in several categories and regions. "
-        "To capitalize on these trends, we recommend focusing marketing efforts on top-performing products and expanding in high-growth regions. "
-        "Continuous monitoring of monthly trends will help anticipate demand fluctuations and optimize inventory management.",
-        body_style))
-    story.append(Spacer(1, 0.2*inch))
-    # story.append(Paragraph(
+    yield Paragraph("Conclusion & Recommendations", _STYLES['heading'])
+    yield Spacer(1, 0.1*inch)
+    yield Paragraph(
+        _CONCLUSION_TEXT(year=year),
+        _STYLES['body'])
+    yield Spacer(1, 0.2*inch)
+    # yield Paragraph(
     #     "For further details or custom analysis, please contact the Sales Analytics Team.",
-    #     small_style))
+    #     _STYLES['small'])
 
-    # Build with page numbers   
-    def on_page(canvas, doc):
-        canvas.saveState()
-        canvas.setFont('Helvetica', 9)
-        canvas.setFillColor(colors.grey)
-        page_num = canvas.getPageNumber()
-        canvas.drawRightString(7.5*inch, 0.5*inch, f"Page {page_num}")
-        canvas.restoreState()
+# Generate PDF report
+def create_pdf_report(filename, data, analysis):
+    # Render into memory and write the file in one go; filename=None returns the PDF bytes instead
+    buf = io.BytesIO()
+    doc = BaseDocTemplate(
+        buf,
+        pagesize=letter,
+        rightMargin=36, leftMargin=36,
+        topMargin=36, bottomMargin=36
+    )
+    # One page template for every page; the footer is drawn by add_page_number once the page is laid out
+    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
+    doc.addPageTemplates([PageTemplate(id='Report', frames=[frame], onPageEnd=add_page_number, pagesize=letter)])
+    year = data['Date'].min().year if not data.empty else 2024
+    month_axis = _month_axis(analysis['by_month'].index)
+
+    # Sections are independent once the analysis is computed; each builder takes no arguments
+    sections = [
+        partial(_section_summary, data, analysis, year),
+        partial(_section_category, analysis, month_axis),
+        partial(_section_products, analysis, month_axis),
+        partial(_section_country, analysis, month_axis),
+        partial(_section_month, analysis, month_axis, year),
+        partial(_section_conclusion, year),
+    ]
+    story = []
+    for build_section in sections:
+        story.extend(build_section())
 
-    doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
+    # build() pops each flowable off the story as it is laid out, so placed flowables can be freed early
+    doc.build(story)
+    if filename is None:
+        return buf.getvalue()
+    with open(filename, 'wb') as fh:
+        fh.write(buf.getbuffer())
 
 if __name__ == "__main__":
     # Configuration
@@ -704,9 +644,13 @@ if __name__ == "__main__":
 
     print(f"Current working directory: {os.getcwd()}")
 
-    # Always generate new sample data for 100 rows
-    df = generate_sample_data(input_file, rows=100)
-    print(f"Sample data generated and saved to {input_file}")
+    # Always generate new sample data for 100 rows; set PERSIST_CSV=1 to also save it
+    persist_csv = os.environ.get("PERSIST_CSV") == "1"
+    df = generate_sample_data(input_file, rows=100, persist_csv=persist_csv)
+    if persist_csv:
+        print(f"Sample data generated and saved to {input_file}")
+    else:
+        print("Sample data generated")
 
     # Analyze data and generate report
     analysis = analyze_data(df)